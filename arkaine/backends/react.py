@@ -2,11 +2,12 @@ from __future__ import annotations
 
 import json
 import pathlib
+import re
+from dataclasses import dataclass
+from functools import lru_cache
 from os import path
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-from pydantic import BaseModel
-
 from arkaine.backends.base import BaseBackend
 from arkaine.llms.llm import LLM, Prompt
 from arkaine.tools.tool import Context, Tool
@@ -14,7 +15,22 @@ from arkaine.tools.types import ToolArguments, ToolResults
 from arkaine.utils.templater import PromptTemplate
 
 
-class ReActResponse(BaseModel):
+@lru_cache(maxsize=None)
+def _cached_template(filepath: str) -> PromptTemplate:
+    """
+    Load the ReAct prompt once per process and share it across every
+    ReActBackend instead of re-reading it from disk on each construction.
+    """
+    return PromptTemplate.from_file(filepath)
+
+
+# Matches a labelled ReAct line, capturing the label and the rest of the
+# line. "Action Input" must precede "Action" so the longer label wins.
+_REACT_LINE_RE = re.compile(r"(Thought|Action Input|Action|Answer):(.*)")
+
+
+@dataclass
+class ReActResponse:
     Thought: str
     Action: Optional[str] = None
     ActionInput: Optional[Dict[str, Any]] = None
@@ -41,7 +57,7 @@ class ReActBackend(BaseBackend):
         )
 
         self.agent_explanation = agent_explanation
-        self.__templater = PromptTemplate.from_file(
+        self.__templater = _cached_template(
             path.join(
                 pathlib.Path(__file__).parent,
                 "prompts",
@@ -60,33 +76,34 @@ class ReActBackend(BaseBackend):
         }
 
         # Extract Thought
-        if lines and lines[0].startswith("Thought:"):
-            results["Thought"] = lines.pop(0).split("Thought:", 1)[1].strip()
+        i = 0
+        match = _REACT_LINE_RE.match(lines[0])
+        if match and match.group(1) == "Thought":
+            results["Thought"] = match.group(2).strip()
+            i = 1
         else:
             # raise FormatException
             results["Thought"] = ""
 
         # Extract Action and Action Input
-        while lines:
-            line = lines.pop(0)
-            if not line.strip():
+        while i < len(lines):
+            match = _REACT_LINE_RE.match(lines[i])
+            i += 1
+            if not match:
                 continue
-            if line.startswith("Action:"):
-                results["Action"] = line.split("Action:", 1)[1].strip()
-            elif line.startswith("Action Input:"):
-                action_input_str = line.split("Action Input:", 1)[1].strip()
+
+            label, value = match.group(1), match.group(2).strip()
+            if label == "Action":
+                results["Action"] = value
+            elif label == "Action Input":
                 try:
                     # Attempt to parse Action Input as JSON
-                    results["Action Input"] = json.loads(action_input_str)
+                    results["Action Input"] = json.loads(value)
                 except json.JSONDecodeError:
-                    results["Action Input"] = action_input_str
-            elif line.startswith("Answer:"):
+                    results["Action Input"] = value
+            elif label == "Answer":
                 # Found the answer, capture it and any remaining lines
-                results["Answer"] = (
-                    line.split("Answer:", 1)[1].strip()
-                    + "\n"
-                    + "\n".join(lines)
-                )
+                results["Answer"] = value + "\n" + "\n".join(lines[i:])
                 break  # Stop processing after finding the answer
 
         # Validation
@@ -97,12 +114,20 @@ class ReActBackend(BaseBackend):
                 results["Action"] = None
                 results["Action Input"] = None
 
-        # Handle missing Answer if Action is present - necessary for
-        # pydantic
+        # Handle missing Answer if Action is present
         if results["Action"] is not None and results["Answer"] is None:
             results["Answer"] = ""
 
-        # Convert Action Input to ActionInput for pydantic
+        # Action Input must be a dict of arguments for the tool
+        if results["Action Input"] is not None and not isinstance(
+            results["Action Input"], dict
+        ):
+            raise ValueError(
+                "Action Input must be a JSON object of arguments, got "
+                + f"{results['Action Input']!r}"
+            )
+
+        # Convert Action Input to ActionInput for the response
         results["ActionInput"] = results["Action Input"]
         del results["Action Input"]
 
@@ -116,7 +141,6 @@ class ReActBackend(BaseBackend):
         ):
             results["Answer"] = text.strip()
 
-        # Use Pydantic for final validation and parsing
         return ReActResponse(**results)
 
     def parse_for_result(self, context: Context, text: str) -> str:
@@ -142,20 +166,15 @@ class ReActBackend(BaseBackend):
         self, context: Context, prompt: Prompt, results: ToolResults
     ) -> List[Prompt]:
         for name, args, result in results:
-            out = f"---\n{name}("
-
-            first_tool = True
-            for arg, value in args.items():
-                if first_tool:
-                    first_tool = False
-                else:
-                    out += ", "
-                out += f"{arg}="
-                if isinstance(value, str):
-                    out += f'"{value}"'
-                else:
-                    out += f"{value}"
-            out += f") returned:\n{result}\n"
+            arguments = ", ".join(
+                (
+                    f'{arg}="{value}"'
+                    if isinstance(value, str)
+                    else f"{arg}={value}"
+                )
+                for arg, value in args.items()
+            )
+            out = f"---\n{name}({arguments}) returned:\n{result}\n"
             prompt.append(
                 {
                     "role": "system",
@@ -1,3 +1,4 @@
+import random
 import time
 from typing import Any, List, Optional, Tuple, Type, Union
 
@@ -19,8 +20,17 @@ class Retry(Tool):
         exceptions (Union[Type[Exception], List[Type[Exception]]], optional):
             Specific exception type(s) to retry on. If None, retries on any
             Exception.
-        delay (float, optional): Time in seconds to wait between retries.
-            Defaults to 0 (no delay).
+        delay (float, optional): Time in seconds to wait before the first
+            retry. Defaults to 0 (no delay).
+        backoff_factor (float, optional): Multiplier applied to the delay
+            after each failed retry, for exponential backoff. Use 1 for a
+            fixed delay. Defaults to 2.
+        max_delay (float, optional): Upper bound in seconds that the backoff
+            may grow the delay to. A larger base delay is left as is.
+            Defaults to 30.
+        jitter (float, optional): Maximum random time in seconds added to
+            each delay so concurrent retries do not stampede the upstream
+            service. Defaults to 0.1.
         name (str, optional): Custom name for the tool.
             Defaults to "{tool.name}::retry_{max_retries}".
         description (str, optional): Custom description.
@@ -37,10 +47,16 @@ class Retry(Tool):
         delay: float = 0,
         name: Optional[str] = None,
         description: Optional[str] = None,
+        backoff_factor: float = 2.0,
+        max_delay: float = 30.0,
+        jitter: float = 0.1,
     ):
         self._tool = tool
         self._max_retries = max_retries
         self._delay = delay
+        self._backoff_factor = backoff_factor
+        self._max_delay = max_delay
+        self._jitter = jitter
 
         # Handle single exception or list of exceptions
         if exceptions is None:
@@ -92,8 +108,14 @@ class Retry(Tool):
                 attempts += 1
 
                 if attempts <= self._max_retries:
-                    if self._delay > 0:
-                        time.sleep(self._delay)
+                    # max_delay caps the backoff growth, but never shortens
+                    # a base delay that was set above it.
+                    delay = min(
+                        self._delay * self._backoff_factor ** (attempts - 1),
+                        max(self._max_delay, self._delay),
+                    )
+                    if delay > 0:
+                        time.sleep(delay + random.uniform(0, self._jitter))
                     continue
                 break
 
@@ -133,15 +155,24 @@ def retry(
     exceptions: Union[Type[Exception], Tuple[Type[Exception], ...]] = Exception,
     name: Optional[str] = None,
     description: Optional[str] = None,
+    backoff_factor: float = 2.0,
+    max_delay: float = 30.0,
+    jitter: float = 0.1,
 ):
     """
     A decorator that wraps a Tool to add retry functionality.
 
     Args:
         max_retries (int): Maximum number of retry attempts. Defaults to 3.
-        delay (float): Delay in seconds between retries. Defaults to 0.
+        delay (float): Delay in seconds before the first retry. Defaults to 0.
         exceptions (Union[Type[Exception], Tuple[Type[Exception], ...]]):
             Exception type(s) to catch and retry on. Defaults to Exception.
+        backoff_factor (float): Multiplier applied to the delay after each
+            failed retry. Defaults to 2.
+        max_delay (float): Upper bound in seconds that the backoff may grow
+            the delay to. A larger base delay is left as is. Defaults to 30.
+        jitter (float): Maximum random seconds added to each delay. Defaults
+            to 0.1.
     """
 
     def decorator(tool: Tool):
@@ -154,6 +185,9 @@ def retry(
             delay,
             name,
             description,
+            backoff_factor,
+            max_delay,
+            jitter,
         )
 
     return decorator
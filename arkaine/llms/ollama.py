@@ -1,3 +1,5 @@
+from typing import Callable, Optional, Union
+
 from ollama import Client
 
 from arkaine.agent import Prompt
@@ -5,6 +7,26 @@ from arkaine.llms.llm import LLM
 
 
 class Ollama(LLM):
+    """
+    An LLM served by a local (or remote) Ollama server.
+
+    Ollama reuses the KV cache of the previous request when the new prompt
+    shares its prefix, so agent loops that resend an identical system/tools
+    block each turn only have to process the new tokens. That reuse is only
+    possible while the model stays loaded; keep_alive controls how long the
+    server holds the model (and its cache) in memory between calls. Callers
+    should keep the prompt prefix byte-identical across turns to benefit.
+
+    Args:
+        keep_alive (Optional[Union[str, float]]): How long the server should
+            keep the model loaded after a request, ie "30m", or seconds as a
+            number. None defers to the server's default. Defaults to "30m".
+        on_token (Optional[Callable[[str], None]]): Called with each chunk
+            of text as it arrives when streaming a completion.
+        stop_when (Optional[Callable[[str], bool]]): Called with the text
+            generated so far when streaming a completion; returning True
+            stops generation early and returns that text.
+    """
 
     CONTEXT_LENGTHS = {
         "llama3.1": 8192,
@@ -18,11 +40,17 @@ class Ollama(LLM):
         default_temperature: float = 0.7,
         request_timeout: float = 120.0,
         verbose: bool = False,
+        keep_alive: Optional[Union[str, float]] = "30m",
+        on_token: Optional[Callable[[str], None]] = None,
+        stop_when: Optional[Callable[[str], bool]] = None,
     ):
         self.model = model
         self.default_temperature = default_temperature
         self.verbose = verbose
         self.host = host
+        self.keep_alive = keep_alive
+        self.on_token = on_token
+        self.stop_when = stop_when
         self.__client = Client(host=self.host)
         self.__context_length = context_length
 
@@ -30,10 +58,32 @@ class Ollama(LLM):
     def context_length(self) -> int:
         return self.__context_length
 
-    def completion(self, prompt: Prompt) -> str:
-        return self.__client.chat(
+    def completion(self, prompt: Prompt, stream: bool = False) -> str:
+        """
+        Generate a completion for the prompt. If stream is set, the response
+        is read chunk by chunk as it is generated, calling on_token for each
+        and stopping early once stop_when is satisfied. The text generated
+        is returned either way.
+        """
+        if not stream:
+            return self.__client.chat(
+                model=self.model,
+                messages=prompt,
+                keep_alive=self.keep_alive,
+            )["message"]["content"]
+
+        text = ""
+        for part in self.__client.chat(
             model=self.model,
             messages=prompt,
-        )[
-            "message"
-        ]["content"]
+            keep_alive=self.keep_alive,
+            stream=True,
+        ):
+            chunk = part["message"]["content"]
+            text += chunk
+            if self.on_token:
+                self.on_token(chunk)
+            if self.stop_when and self.stop_when(text):
+                break
+
+        return text
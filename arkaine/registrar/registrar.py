@@ -1,6 +1,6 @@
 from concurrent.futures import ThreadPoolExecutor
 from threading import Lock
-from typing import TYPE_CHECKING, Callable, Dict, List
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
 if TYPE_CHECKING:
     from arkaine.tools.tool import Context, Tool
@@ -9,37 +9,80 @@ if TYPE_CHECKING:
 class Registrar:
     _lock = Lock()
     _enabled = False
-    __executor = ThreadPoolExecutor()
+    # The executor is created on first use so that importing the registrar
+    # (or never enabling it) does not spin up any threads.
+    __executor: Optional[ThreadPoolExecutor] = None
+    __max_workers = 8
 
     _tools: 'Dict[str, "Tool"]' = {}
 
     __on_tool_listeners: List[Callable[["Tool"], None]] = []
-    __on_tool_call_listeners: List[Callable[["Tool", "Context"], None]] = []
+    # Tool call listeners are an immutable tuple that is replaced on write,
+    # so _on_tool_call can read it without acquiring the lock.
+    __on_tool_call_listeners: Tuple[
+        Callable[["Tool", "Context"], None], ...
+    ] = ()
 
     def __new__(cls):
         raise ValueError("Registrar cannot be instantiated")
 
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        if cls.__executor is None:
+            with cls._lock:
+                if cls.__executor is None:
+                    cls.__executor = ThreadPoolExecutor(
+                        max_workers=cls.__max_workers,
+                        thread_name_prefix="registrar",
+                    )
+        return cls.__executor
+
+    @classmethod
+    def shutdown(cls, wait: bool = False):
+        """
+        Shut down the listener executor, if one was created. A new one is
+        created should the registrar need to notify listeners again.
+        """
+        with cls._lock:
+            executor = cls.__executor
+            cls.__executor = None
+
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
     @classmethod
     def register(cls, tool: "Tool"):
+        # Registering an already known tool is a no-op; the unlocked check
+        # lets repeat registrations skip the lock entirely.
+        if tool.id in cls._tools:
+            return
+
         with cls._lock:
             if tool.id in cls._tools:
-                pass
+                return
             cls._tools[tool.id] = tool
-
-            for listener in cls.__on_tool_listeners:
-                cls.__executor.submit(listener, tool)
+            listeners = list(cls.__on_tool_listeners)
 
             tool.add_on_call_listener(cls._on_tool_call)
 
+        for listener in listeners:
+            cls._get_executor().submit(listener, tool)
+
     @classmethod
     def _on_tool_call(cls, tool: "Tool", ctx: "Context"):
         """
         Whenever a tool we are aware of is called, notify the listener
         """
-        with cls._lock:
-            if cls._enabled:
-                for listener in cls.__on_tool_call_listeners:
-                    cls.__executor.submit(listener, tool, ctx)
+        if not cls._enabled:
+            return
+
+        listeners = cls.__on_tool_call_listeners
+        if not listeners:
+            return
+
+        executor = cls._get_executor()
+        for listener in listeners:
+            executor.submit(listener, tool, ctx)
 
     @classmethod
     def add_on_tool_register(cls, listener: Callable[["Tool"], None]):
@@ -66,7 +109,9 @@ class Registrar:
         cls, listener: Callable[["Tool", "Context"], None]
     ):
         with cls._lock:
-            cls.__on_tool_call_listeners.append(listener)
+            cls.__on_tool_call_listeners = cls.__on_tool_call_listeners + (
+                listener,
+            )
 
     @classmethod
     def enable(cls):
@@ -1,8 +1,12 @@
 import pathlib
 import re
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import chain
 from os import path
-from typing import Any, Dict, List, Optional
+from threading import Lock
+from typing import Any, Dict, FrozenSet, List, Optional
 
 from requests.exceptions import HTTPError
 
@@ -14,15 +18,124 @@ from arkaine.llms.llm import LLM
 from arkaine.toolbox.summarizer import Summarizer
 from arkaine.toolbox.webqueryer import Webqueryer
 from arkaine.toolbox.websearch import Websearch, Website
-from arkaine.tools.tool import Argument
+from arkaine.tools.tool import Argument, Context
 from arkaine.utils.templater import PromptTemplate
 
+# Compiled once at import as __strip_url is called for every search result.
+# The suffix pattern removes query parameters, anchors, and trailing slashes;
+# the prefix pattern removes http://, https://, and www.
+_URL_SUFFIX_RE = re.compile(r"/*(?:[?#].*)?$")
+_URL_PREFIX_RE = re.compile(r"^(?:https?://)?(?:www\.)?")
+
+# SITE/REASON pairs are parsed in a single pass over the whole LLM output.
+# A pair is a SITE line followed by the first non-empty REASON line, with
+# any unrelated lines in between ignored. A new SITE line before a REASON
+# restarts the pair. [^\S\n] is "whitespace other than a newline".
+_JUDGE_PAIR_RE = re.compile(
+    r"^(?:[\d.\-*]|[^\S\n])*site:[^\S\n]*(?P<site>\S[^\n]*)$"
+    r"(?:\n(?!(?:[\d.\-*]|[^\S\n])*site:)[^\n]*)*?"
+    r"\n(?:[\d.\-*]|[^\S\n])*reason:[^\S\n]*(?P<reason>\S[^\n]*)$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_SITE_REASON_RE = re.compile(
+    r"(?<!\S)site:[^\S\n]*(?P<site>\S[^\n]*)$"
+    r"(?:\n(?![^\n]*(?<!\S)site:[^\S\n]*\S)[^\n]*)*?"
+    r"\n(?![^\n]*(?<!\S)site:[^\S\n]*\S)"
+    r"[^\n]*?(?<!\S)reason:[^\S\n]*(?P<reason>\S[^\n]*)$",
+    re.IGNORECASE | re.MULTILINE,
+)
+_LLM_MARKERS_RE = re.compile(
+    r"^(Thought|Observation|Action):\s*", flags=re.MULTILINE
+)
+_MARKDOWN_LINK_RE = re.compile(r"\[(.*?)\]\((.*?)\)")
+_MARKDOWN_CHARS = str.maketrans("", "", "*_`")
+
+# Topics are reduced to a set of keywords for the WebSearcher plan cache so
+# that rewordings of the same topic share cached sites.
+_KEYWORD_RE = re.compile(r"\w+")
+_STOPWORDS = frozenset(
+    (
+        "a about an and are as at be by can do does for from how i in is it "
+        "me of on or that the this to was what when where which who why with"
+    ).split()
+)
+
+
+@lru_cache(maxsize=None)
+def _cached_template(filepath: str) -> PromptTemplate:
+    # Templates are only ever rendered with explicit variables, so a single
+    # parsed instance per prompt file is safe to share between agents.
+    return PromptTemplate.from_file(filepath)
+
+
+# Site fetching and summarizing is I/O bound work, so a single bounded pool
+# is shared by every WebSearcher rather than each holding its own threads.
+_SITE_THREADPOOL: Optional[ThreadPoolExecutor] = None
+_SITE_THREADPOOL_LOCK = Lock()
+
+
+def _site_threadpool() -> ThreadPoolExecutor:
+    global _SITE_THREADPOOL
+    if _SITE_THREADPOOL is None:
+        with _SITE_THREADPOOL_LOCK:
+            if _SITE_THREADPOOL is None:
+                _SITE_THREADPOOL = ThreadPoolExecutor(
+                    thread_name_prefix="web_searcher::sites"
+                )
+    return _SITE_THREADPOOL
+
 
 class WebSearcher(Linear):
-    def __init__(self, llm: LLM, websearch: Optional[Websearch] = None):
+    """
+    Research a topic by generating search queries, searching the web,
+    judging which results are relevant, and summarizing those sites.
+
+    Sites chosen by the judge are cached in a bounded LRU keyed by the
+    keywords of the topic. When a later topic shares the same keywords the
+    query generation and web search steps are skipped, and the cached sites
+    are handed straight back to the judge.
+
+    Args:
+        llm (LLM): The LLM used for query generation, judging, and
+            summarization.
+        websearch (Optional[Websearch]): The search tool to use. Defaults to
+            a DuckDuckGo Websearch.
+        plan_cache_size (int): Maximum number of topics to remember sites
+            for. 0 disables the cache. Defaults to 32.
+    """
+
+    def __init__(
+        self,
+        llm: LLM,
+        websearch: Optional[Websearch] = None,
+        plan_cache_size: int = 32,
+    ):
         if not websearch:
             websearch = Websearch()
 
+        self.__webqueryer = Webqueryer(llm)
+        self.__search = ParallelList(
+            websearch,
+            arguments=[
+                Argument(
+                    "query_list",
+                    "A list of web searh queries to to perform",
+                    "list[Website]",
+                    required=True,
+                )
+            ],
+            result_formatter=self.process_search_results,
+            # item_formatter=lambda context, query: {"query": query},
+        )
+
+        self.__site_summarizer = Summarizer(llm, focus_query=True)
+
+        self.__plan_cache: OrderedDict[FrozenSet[str], List[Website]] = (
+            OrderedDict()
+        )
+        self.__plan_cache_size = plan_cache_size
+        self.__plan_cache_lock = Lock()
+
         super().__init__(
             name="web_searcher",
             description="Given a topic or task, perform web searches to find "
@@ -37,30 +150,14 @@ class WebSearcher(Linear):
             ],
             examples=[],
             steps=[
-                Webqueryer(llm),
-                lambda queries: {"query_list": [{"query": q} for q in queries]},
-                ParallelList(
-                    websearch,
-                    arguments=[
-                        Argument(
-                            "query_list",
-                            "A list of web searh queries to to perform",
-                            "list[Website]",
-                            required=True,
-                        )
-                    ],
-                    result_formatter=self.process_search_results,
-                    # item_formatter=lambda context, query: {"query": query},
-                ),
+                self.find_sites,
                 lambda context, sites: {
                     "sites": sites,
                     "query": context.x["init_input"]["topic"],
                 },
                 SearchQueryJudge(llm),
-                self.process_websites,
-                ParallelList(
-                    Summarizer(llm, focus_query=True),
-                ),
+                self.cache_sites,
+                self.summarize_websites,
                 lambda context, summaries: {
                     "query": context.x["init_input"]["topic"],
                     "text": "The following are summaries of several "
@@ -72,52 +169,128 @@ class WebSearcher(Linear):
             ],
         )
 
+    def __topic_keywords(self, topic: str) -> FrozenSet[str]:
+        return frozenset(
+            word
+            for word in _KEYWORD_RE.findall(topic.lower())
+            if word not in _STOPWORDS
+        )
+
+    def find_sites(self, context: Context, topic: str) -> List[Website]:
+        """
+        Return candidate sites for the topic - from the plan cache if a prior
+        topic shared its keywords, otherwise by generating search queries and
+        running them.
+        """
+        # A topic made up only of stopwords has nothing to key on, and would
+        # otherwise share a single slot with every other such topic.
+        keywords = self.__topic_keywords(topic)
+        if keywords:
+            with self.__plan_cache_lock:
+                sites = self.__plan_cache.get(keywords)
+                if sites is not None:
+                    self.__plan_cache.move_to_end(keywords)
+                    return list(sites)
+
+        queries = self.__webqueryer(context, topic=topic)
+
+        return self.__search(
+            context, input=[{"query": query} for query in queries]
+        )
+
+    def cache_sites(
+        self, context: Context, sites: List[Website]
+    ) -> List[Website]:
+        """
+        Remember the judged sites for the topic's keywords, evicting the least
+        recently used topic once the cache is full. The sites are passed
+        through unchanged.
+        """
+        if self.__plan_cache_size <= 0 or not sites:
+            return sites
+
+        keywords = self.__topic_keywords(context.x["init_input"]["topic"])
+        if not keywords:
+            return sites
+
+        with self.__plan_cache_lock:
+            self.__plan_cache[keywords] = list(sites)
+            self.__plan_cache.move_to_end(keywords)
+            while len(self.__plan_cache) > self.__plan_cache_size:
+                self.__plan_cache.popitem(last=False)
+
+        return sites
+
     def __strip_url(self, url: str) -> str:
         """
         Remove all extraneous URL additives, such as ?, #, and trailing
         slashes. We also will remove http://, https://, and www.
         """
-        url = re.sub(r"\?.*", "", url)  # Remove query parameters
-        url = re.sub(r"#.*", "", url)  # Remove anchor
-        url = re.sub(r"\/+$", "", url)  # Remove trailing slashes
-        url = re.sub(r"^https?:\/\/", "", url)  # Remove http:// or https://
-        url = re.sub(r"^www\.", "", url)  # Remove www.
-        return url
+        # Many results are already canonical; skip the regex work for them
+        if (
+            "?" not in url
+            and "#" not in url
+            and not url.endswith("/")
+            and not url.startswith(("http://", "https://", "www."))
+        ):
+            return url
+
+        url = _URL_SUFFIX_RE.sub("", url, count=1)
+        return _URL_PREFIX_RE.sub("", url, count=1)
 
     def process_search_results(
         self, results: List[List[Website]]
     ) -> List[Website]:
-        # First we convert the list of lists into a single list
-        results = [item for sublist in results for item in sublist]
-
-        # Find all the sites that are likely to be duplicates and remove them
-        unique_results = OrderedDict()
-
-        for result in results:
+        # Flatten the list of lists and drop sites that are likely to be
+        # duplicates in a single pass, keeping the first occurrence.
+        unique_results: Dict[str, Website] = {}
+        for result in chain.from_iterable(results):
             stripped_url = self.__strip_url(result.url)
             if stripped_url not in unique_results:
                 unique_results[stripped_url] = result
 
         return list(unique_results.values())
 
-    def process_websites(self, context, sites):
-        output = []
-        for site in sites:
-            try:
-                output.append(
-                    {
-                        "text": site.get_markdown(),
-                        "query": context.x["init_input"]["topic"],
-                        "length": "a short summary",
-                    }
-                )
-            except HTTPError:
-                # Ignore HTTP errors as that is typically
-                # the site selected is down or cranky that we're
-                # trying to scrape it.
-                pass
+    def __summarize_website(
+        self, context: Context, site: Website, query: str
+    ) -> Optional[str]:
+        try:
+            text = site.get_markdown()
+        except HTTPError:
+            # Ignore HTTP errors as that is typically
+            # the site selected is down or cranky that we're
+            # trying to scrape it.
+            return None
+
+        return self.__site_summarizer(
+            context, text=text, query=query, length="a short summary"
+        )
+
+    def summarize_websites(
+        self, context: Context, sites: List[Website]
+    ) -> List[str]:
+        """
+        Fetch and summarize each site. Every worker fetches its site and then
+        immediately summarizes it, so slow fetches overlap with other fetches
+        and with summarization rather than all fetches finishing first.
+        Summaries are returned in the order of the given sites; sites that
+        could not be fetched are skipped.
+        """
+        query = context.x["init_input"]["topic"]
 
-        return {"input": output}
+        threadpool = _site_threadpool()
+        futures = {
+            threadpool.submit(
+                self.__summarize_website, context, site, query
+            ): idx
+            for idx, site in enumerate(sites)
+        }
+
+        summaries: List[Optional[str]] = [None] * len(sites)
+        for future in as_completed(futures):
+            summaries[futures[future]] = future.result()
+
+        return [summary for summary in summaries if summary is not None]
 
 
 class SearchQueryJudge(Agent):
@@ -147,7 +320,7 @@ class SearchQueryJudge(Agent):
             process_answer=self.process_answer,
         )
 
-        self.__template = PromptTemplate.from_file(
+        self.__template = _cached_template(
             path.join(
                 pathlib.Path(__file__).parent,
                 "prompts",
@@ -184,54 +357,30 @@ class SearchQueryJudge(Agent):
             return []
 
         websites = []
-        current_site = None
-        current_reason = None
-
-        for line in output.split("\n"):
-            line = line.strip()
-            if not line:
-                continue
-
-            # Remove any leading bullet points or numbers
-            line = re.sub(r"^[\d\.\-\*\s]+", "", line)
-
-            if line.upper().startswith("SITE:"):
-                # If we have a complete site/reason pair, add it
-                if current_site and current_reason:
-                    websites.append(
-                        Website(current_site, snippet=current_reason)
-                    )
-
-                # Start new site
-                current_site = line[5:].strip()
-                current_reason = None
-            elif line.upper().startswith("REASON:"):
-                current_reason = line[7:].strip()
-                # If we have both site and reason, create Website
-                if current_site and current_reason:
-                    websites.append(
-                        Website(current_site, snippet=current_reason)
-                    )
-
-                    current_site = None
-                    current_reason = None
-
-        # Handle any remaining pair
-        if current_site and current_reason:
-            websites.append(Website(current_site, snippet=current_reason))
-
-        for website in websites:
-            try:
-                website.get_title()
-            except HTTPError:
-                # We are ignoring HTTP errors as that is typically
-                # the site selected is down or cranky that we're
-                # trying to scrape it.
-                pass
+        for match in _JUDGE_PAIR_RE.finditer(output):
+            websites.append(
+                Website(
+                    match.group("site").strip(),
+                    snippet=match.group("reason").strip(),
+                )
+            )
 
         if len(websites) == 0:
             raise ValueError("No websites found")
 
+        # Fetching titles is a blocking request per site, so we fetch
+        # them concurrently.
+        with ThreadPoolExecutor(max_workers=min(16, len(websites))) as executor:
+            futures = [executor.submit(site.get_title) for site in websites]
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except HTTPError:
+                    # We are ignoring HTTP errors as that is typically
+                    # the site selected is down or cranky that we're
+                    # trying to scrape it.
+                    pass
+
         return websites
 
 
@@ -281,7 +430,7 @@ class Websearcher2(Agent):
             self.process_answer,
         )
 
-        self.__template = PromptTemplate.from_file(
+        self.__template = _cached_template(
             path.join(
                 pathlib.Path(__file__).parent,
                 "prompts",
@@ -307,86 +456,28 @@ class Websearcher2(Agent):
         Returns:
             list[Website]: List of Website objects with titles and URLs
         """
-        # Clean up the input by removing common LLM output markers
-        answer = re.sub(
-            r"^(Thought|Observation|Action):\s*", "", answer, flags=re.MULTILINE
-        )
-
-        # Split into lines and clean up
-        lines = [line.strip() for line in answer.split("\n") if line.strip()]
+        # Clean up the input by removing common LLM output markers and
+        # markdown formatting characters
+        answer = _LLM_MARKERS_RE.sub("", answer).translate(_MARKDOWN_CHARS)
 
         results = []
-        current_site = None
-        current_url = None
-        current_reason = None
-
-        for line in lines:
-            # Remove common markdown formatting characters
-            line = re.sub(r"[*_`]", "", line)
+        for match in _SITE_REASON_RE.finditer(answer):
+            url = match.group("site").strip()
+            title = url
 
-            # Check for SITE: in any case with optional formatting
-            site_match = re.search(
-                r"(?:^|\s)site:\s*(.+?)(?:\s*$)", line, re.IGNORECASE
-            )
-            if site_match:
-                # If we have a previous complete entry, add it
-                if current_url and current_reason:
-                    results.append(
-                        Website(
-                            url=current_url,
-                            title=(
-                                current_site.title
-                                if current_site
-                                else current_url
-                            ),
-                            snippet=current_reason,
-                        )
-                    )
-
-                site_content = site_match.group(1).strip()
-                # Check if the site content contains a markdown link
-                md_match = re.search(r"\[(.*?)\]\((.*?)\)", site_content)
+            # Check if the site content contains a markdown link
+            if "[" in url:
+                md_match = _MARKDOWN_LINK_RE.search(url)
                 if md_match:
                     title, url = md_match.groups()
-                    current_url = url
-                    current_site = Website(url=url, title=title)
-                else:
-                    current_url = site_content
-                    current_site = None
-                current_reason = None
-                continue
-
-            # Handle reason lines (case insensitive)
-            reason_match = re.search(
-                r"(?:^|\s)reason:\s*(.+?)(?:\s*$)", line, re.IGNORECASE
-            )
-            if reason_match:
-                current_reason = reason_match.group(1).strip()
-
-                # If we have both URL and reason, add the entry
-                if current_url and current_reason:
-                    results.append(
-                        Website(
-                            url=current_url,
-                            title=(
-                                current_site.title
-                                if current_site
-                                else current_url
-                            ),
-                            snippet=current_reason,
-                        )
-                    )
-                    current_url = None
-                    current_site = None
-                    current_reason = None
-
-        # Add the last entry if complete
-        if current_url and current_reason:
+                    if not url:
+                        continue
+
             results.append(
                 Website(
-                    url=current_url,
-                    title=current_site.title if current_site else current_url,
-                    snippet=current_reason,
+                    url=url,
+                    title=title,
+                    snippet=match.group("reason").strip(),
                 )
             )
 
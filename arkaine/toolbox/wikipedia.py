@@ -1,15 +1,28 @@
-from typing import Any, Dict, List, Optional
-
+import json
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from threading import Lock, local
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import requests
 import wikipedia
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from arkaine.agent import BackendAgent
 from arkaine.backends.base import BaseBackend
 from arkaine.backends.react import ReActBackend
 from arkaine.llms.llm import LLM
-from arkaine.tools.tool import Argument, Tool
+from arkaine.tools.tool import Argument, Context, Tool
 from arkaine.tools.wrappers.top_n import TopN
 from arkaine.utils.documents import (
     InMemoryEmbeddingStore,
+    Int8EmbeddingStore,
     chunk_text_by_sentences,
 )
 from arkaine.utils.templater import PromptTemplate
@@ -17,10 +30,309 @@ from arkaine.utils.templater import PromptTemplate
 TOPIC_QUERY_TOOL_NAME = "wikipedia_search_pages"
 PAGE_CONTENT_TOOL_NAME = "wikipedia_get_page"
 
+# A section header is any line that both starts and ends with '=', ie
+# "== History ==".
+_SECTION_RE = re.compile(r"^(=(?:[^\n]*=)?)$", re.MULTILINE)
+_PREAMBLE_TITLE = "_preamble"
+
+
+def _break_down_content(content: str) -> Tuple[List[str], List[str]]:
+    """
+    Break down Wikipedia content into sections and their corresponding
+    chunks.
+
+    Wikipedia content is separated by section headers marked with '='
+    characters. This splits the content into sections and chunks each
+    section's text into smaller, sentence-based segments.
+
+    Args:
+        content (str): Raw Wikipedia page content
+
+    Returns:
+        Tuple[List[str], List[str]]: The section titles and, in the same
+            order, the text from each section. Note we do not have nesting
+            (subsections) - it's all one level deep.
+    """
+    # Splitting on a capturing group yields the text before the first header
+    # followed by alternating header lines and section bodies.
+    parts = _SECTION_RE.split(content)
+
+    titles: List[str] = []
+    texts: List[str] = []
+
+    # The untitled lead of the article, if any, gets a placeholder title
+    preamble = " ".join(parts[0].split())
+    if preamble:
+        titles.append(_PREAMBLE_TITLE)
+        texts.append(preamble)
+
+    for header, body in zip(parts[1::2], parts[2::2]):
+        text = " ".join(body.split())
+        if text:
+            titles.append(header.strip(" ="))
+            texts.append(text)
+
+    return titles, texts
+
+
+# The wikipedia library opens a fresh connection for every request, so API
+# calls are instead made through one pooled, keep-alive session shared by
+# the whole process. Wikipedia throttles anonymous user agents, so we
+# identify ourselves.
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = "arkaine (https://github.com/hlfshell/arkaine)"
+for _prefix in ("http://", "https://"):
+    _SESSION.mount(
+        _prefix,
+        HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.2),
+        ),
+    )
+
+
+def _api_request(params: Dict[str, Any]) -> Dict[str, Any]:
+    response = _SESSION.get(
+        wikipedia.wikipedia.API_URL,
+        params={"action": "query", "format": "json", **params},
+        timeout=10,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+# Agents frequently repeat the same searches and page lookups within a
+# session, so both network calls are memoized. Page results are cached
+# after being broken down into sections. Either call falls back to the
+# wikipedia library on failure so that its errors surface as before.
+@lru_cache(maxsize=1024)
+def _cached_search(query: str) -> Tuple[str, ...]:
+    try:
+        results = _api_request(
+            {"list": "search", "srprop": "", "srlimit": 10, "srsearch": query}
+        )
+        return tuple(result["title"] for result in results["query"]["search"])
+    except (requests.RequestException, ValueError, KeyError):
+        return tuple(wikipedia.search(query))
+
+
+def _fetch_content(title: str) -> str:
+    """
+    Fetch the plaintext content of a Wikipedia page.
+
+    wikipedia.page() costs up to three round trips (a suggestion search, a
+    page lookup, then the content itself), so the extract is requested
+    directly from the MediaWiki API in a single call instead. Should that
+    fail, or the title be missing or a disambiguation page, we fall back to
+    wikipedia.page() so its errors surface exactly as before.
+    """
+    try:
+        page = _api_request(
+            {
+                "formatversion": 2,
+                "prop": "extracts|pageprops",
+                "ppprop": "disambiguation",
+                "explaintext": 1,
+                "exsectionformat": "wiki",
+                "redirects": 1,
+                "titles": title,
+            }
+        )["query"]["pages"][0]
+
+        if (
+            "missing" not in page
+            and "disambiguation" not in page.get("pageprops", {})
+            and page.get("extract")
+        ):
+            return page["extract"]
+    except (requests.RequestException, ValueError, KeyError, IndexError):
+        pass
+
+    # wikipedia.page() has no timeout, so background prefetches never fall
+    # back to it; the foreground request will do so if it needs to.
+    if getattr(_prefetch_state, "active", False):
+        raise LookupError(f"could not prefetch {title}")
+
+    return wikipedia.page(title).content
+
+
+@lru_cache(maxsize=1024)
+def _cached_page(title: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    titles, texts = _break_down_content(_fetch_content(title))
+    return tuple(titles), tuple(texts)
+
+
+# Pages are speculatively fetched in the background once a topic search
+# returns, overlapping the download with the LLM deciding which page to
+# read. In-flight fetches are tracked by title so a page requested while
+# its prefetch is running waits on it instead of fetching it again.
+_PREFETCH_MAX_PENDING = 32
+_prefetch_futures: Dict[str, Future] = {}
+_prefetch_executor: Optional[ThreadPoolExecutor] = None
+_prefetch_lock = Lock()
+_prefetch_state = local()
+
+
+def _prefetch_page(title: str):
+    _prefetch_state.active = True
+    try:
+        _cached_page(title)
+    finally:
+        _prefetch_state.active = False
+
+
+def _prefetch_pages(titles: List[str]):
+    global _prefetch_executor
+    with _prefetch_lock:
+        if _prefetch_executor is None:
+            _prefetch_executor = ThreadPoolExecutor(max_workers=4)
+
+        for title in titles:
+            if title in _prefetch_futures:
+                continue
+            # Drop the oldest prefetches that were never asked for, and
+            # cancel them if they have yet to start
+            while len(_prefetch_futures) >= _PREFETCH_MAX_PENDING:
+                _prefetch_futures.pop(next(iter(_prefetch_futures))).cancel()
+            _prefetch_futures[title] = _prefetch_executor.submit(
+                _prefetch_page, title
+            )
+
+
+def _get_page(title: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    with _prefetch_lock:
+        future = _prefetch_futures.pop(title, None)
+
+    if future is not None:
+        # Once the prefetch finishes the page is in _cached_page's cache. If
+        # it failed, or is slow, we fall through and fetch it ourselves so
+        # that any error is raised here as usual.
+        try:
+            future.result(timeout=5)
+        except Exception:
+            pass
+
+    return _cached_page(title)
+
+
+class WikipediaDiskCache:
+    """
+    A SQLite backed cache of parsed Wikipedia pages and section embeddings,
+    so that warm starts skip both the network fetch and the embedding
+    compute.
+
+    Args:
+        cache_dir (str): Directory to hold the cache database. It is created
+            if it does not exist.
+    """
+
+    def __init__(self, cache_dir: str):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.__lock = Lock()
+        self.__conn = sqlite3.connect(
+            os.path.join(cache_dir, "wikipedia.db"), check_same_thread=False
+        )
+        with self.__lock, self.__conn:
+            self.__conn.execute(
+                "CREATE TABLE IF NOT EXISTS pages ("
+                + "title TEXT PRIMARY KEY, "
+                + "sections TEXT NOT NULL, "
+                + "fetched_at INTEGER NOT NULL)"
+            )
+            self.__conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                + "model TEXT NOT NULL, "
+                + "text TEXT NOT NULL, "
+                + "vec BLOB NOT NULL, "
+                + "PRIMARY KEY (model, text))"
+            )
+
+    def get_sections(self, title: str) -> Optional[Tuple[List[str], List[str]]]:
+        with self.__lock:
+            row = self.__conn.execute(
+                "SELECT sections FROM pages WHERE title = ?", (title,)
+            ).fetchone()
+        if not row:
+            return None
+
+        titles, texts = json.loads(row[0])
+        return titles, texts
+
+    def set_sections(self, title: str, titles: List[str], texts: List[str]):
+        with self.__lock, self.__conn:
+            self.__conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?)",
+                (title, json.dumps([titles, texts]), int(time.time())),
+            )
+
+    def get_embedding(self, model: str, text: str) -> Optional[List[float]]:
+        with self.__lock:
+            row = self.__conn.execute(
+                "SELECT vec FROM embeddings WHERE model = ? AND text = ?",
+                (model, text),
+            ).fetchone()
+        if not row:
+            return None
+        return np.frombuffer(row[0], dtype=np.float32).tolist()
+
+    def set_embedding(self, model: str, text: str, embedding: List[float]):
+        vec = np.asarray(embedding, dtype=np.float32).tobytes()
+        with self.__lock, self.__conn:
+            self.__conn.execute(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)",
+                (model, text, vec),
+            )
+
+
+class _DiskCachedEmbeddingStore(InMemoryEmbeddingStore):
+    """
+    An InMemoryEmbeddingStore that loads embeddings from a
+    WikipediaDiskCache when present, and stores any it has to compute.
+    """
+
+    def __init__(
+        self, cache: WikipediaDiskCache, embedding_model: Optional[str] = None
+    ):
+        super().__init__(embedding_model)
+        self.__cache = cache
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        model = self.__embedding_model__
+        embeddings = [self.__cache.get_embedding(model, text) for text in texts]
+
+        # Embed everything that was not cached in a single batch
+        missing = [
+            i for i, embedding in enumerate(embeddings) if embedding is None
+        ]
+        if missing:
+            computed = super().get_embeddings([texts[i] for i in missing])
+            for i, embedding in zip(missing, computed):
+                embeddings[i] = embedding
+                self.__cache.set_embedding(model, texts[i], embedding)
+
+        return embeddings
+
+
+class _DiskCachedInt8EmbeddingStore(
+    _DiskCachedEmbeddingStore, Int8EmbeddingStore
+):
+    pass
+
 
 class WikipediaTopicQuery(Tool):
+    """
+    A tool that searches Wikipedia for the titles of pages matching a query.
+
+    Args:
+        prefetch (int): How many of the top matching pages to start fetching
+            in the background, ready for the follow-up page request.
+            Defaults to 3; 0 disables prefetching.
+    """
+
+    def __init__(self, prefetch: int = 3):
+        self.__prefetch = prefetch
 
-    def __init__(self):
         super().__init__(
             TOPIC_QUERY_TOOL_NAME,
             "Search Wikipedia for articles that match a given query topic -"
@@ -41,21 +353,44 @@ class WikipediaTopicQuery(Tool):
             self.topic_query,
         )
 
-    def topic_query(self, query: str) -> List[str]:
-        topics = wikipedia.search(query)
+    def topic_query(self, query: str) -> str:
+        topics = _cached_search(query.strip().lower())
         if len(topics) == 0:
             return "No topics match this query"
 
-        out = "The following are titles to pages that match your query:\n"
-        for topic in topics:
-            out += topic + "\n"
+        if self.__prefetch > 0:
+            _prefetch_pages(topics[: self.__prefetch])
 
-        return out
+        return (
+            "The following are titles to pages that match your query:\n"
+            + "\n".join(topics)
+            + "\n"
+        )
 
 
 class WikipediaPage(Tool):
+    """
+    A tool that returns the content of a Wikipedia page broken down into
+    sections.
+
+    Args:
+        cache_dir (Optional[str]): If provided, parsed pages are persisted
+            to a WikipediaDiskCache in this directory and reused across
+            process restarts.
+        cache (Optional[WikipediaDiskCache]): An existing cache to persist
+            pages to, so it can be shared with other users of the same
+            database. Takes precedence over cache_dir.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        cache: Optional[WikipediaDiskCache] = None,
+    ):
+        if cache is None and cache_dir:
+            cache = WikipediaDiskCache(cache_dir)
+        self.__cache = cache
 
-    def __init__(self):
         super().__init__(
             PAGE_CONTENT_TOOL_NAME,
             (
@@ -75,72 +410,96 @@ class WikipediaPage(Tool):
             self.get_page,
         )
 
-    def __break_down_content(self, content: str) -> Dict[str, str]:
-        """
-        Break down Wikipedia content into sections and their corresponding
-        chunks.
+    def get_page(self, title: str) -> Dict[str, str]:
+        return dict(zip(*self.get_page_sections(title)))
 
-        Wikipedia content is separated by section headers marked with '='
-        characters. This method splits the content into sections and chunks
-        each section's text into smaller, sentence-based segments.
+    def get_page_sections(self, title: str) -> Tuple[List[str], List[str]]:
+        """
+        Get the content of a page as parallel lists of section titles and
+        section texts, for consumers that work on the texts as a batch and
+        have no use for a dict keyed by title.
 
         Args:
-            content (str): Raw Wikipedia page content
+            title (str): The title of the Wikipedia page
 
         Returns:
-            Dict[str, str]: Dictionary where keys are section titles and
-                values the text from that section. Note we do not have nesting
-                (subsections) - it's all one level deep.
+            Tuple[List[str], List[str]]: The section titles and, in the same
+                order, the text of each section.
         """
-        # For cleanliness we're adding a fake title if none exists
-        content = "= Title =\n\n" + content
-
-        sections: Dict[str, str] = {}
-        current_section = []
-        current_title = ""
+        title = title.strip()
 
-        for line in content.split("\n"):
-            if line.strip() == "":
-                continue
-
-            if line[0] == "=" and line[-1] == "=":
-                if len(current_section) > 0:
-                    sections[current_title] = " ".join(current_section)
-                    current_section = []
-                current_title = line.strip(" =")
-            else:
-                current_section.append(line)
+        if self.__cache is None:
+            titles, texts = _get_page(title)
+            return list(titles), list(texts)
 
-        # Don't forget the last section
-        if len(current_section) > 0:
-            sections[current_title] = " ".join(current_section)
+        sections = self.__cache.get_sections(title)
+        if sections is None:
+            titles, texts = _get_page(title)
+            sections = list(titles), list(texts)
+            self.__cache.set_sections(title, *sections)
 
         return sections
 
-    def get_page(self, title: str) -> Dict[str, str]:
-        content = wikipedia.page(title).content
-
-        sections = self.__break_down_content(content)
 
-        return sections
+class WikipediaPageTopN(TopN):
+    """
+    A WikipediaPage wrapped to return only the sections most relevant to a
+    query.
 
+    Args:
+        name (Optional[str]): Name of the tool. Defaults to "wikipedia_page".
+        wp (Optional[WikipediaPage]): The page tool to wrap. Defaults to a
+            new WikipediaPage using cache_dir.
+        embedder (Optional[InMemoryEmbeddingStore]): Embedding store to rank
+            sections with. Defaults to a new InMemoryEmbeddingStore (or
+            Int8EmbeddingStore if quantize is set), which loads and saves its
+            embeddings via cache_dir if one is given.
+        n (int): Number of sections to return. Defaults to 5.
+        cache_dir (Optional[str]): If provided, parsed pages and their
+            embeddings are persisted in this directory across restarts.
+        quantize (bool): If True and no embedder is provided, section
+            embeddings are held as int8 to cut memory and speed up ranking.
+            Defaults to False.
+        min_chars (int): Sections with fewer characters than this are
+            dropped before ranking, sparing the embedding compute on stub
+            sections. Only applies when wp is a WikipediaPage. Defaults to 0
+            (keep every section).
+    """
 
-class WikipediaPageTopN(TopN):
     def __init__(
         self,
         name: Optional[str] = None,
         wp: Optional[WikipediaPage] = None,
         embedder: Optional[InMemoryEmbeddingStore] = None,
         n: int = 5,
+        cache_dir: Optional[str] = None,
+        quantize: bool = False,
+        min_chars: int = 0,
     ):
+        self.__min_chars = min_chars
+
+        # The page tool and embedding store share one connection to the
+        # cache database rather than contending over two.
+        cache = WikipediaDiskCache(cache_dir) if cache_dir else None
+
         if wp is None:
-            wp = WikipediaPage()
+            wp = WikipediaPage(cache=cache)
 
         if name is None:
             name = "wikipedia_page"
 
         if embedder is None:
-            embedder = InMemoryEmbeddingStore()
+            if cache is not None:
+                store = (
+                    _DiskCachedInt8EmbeddingStore
+                    if quantize
+                    else _DiskCachedEmbeddingStore
+                )
+                embedder = store(cache)
+            elif quantize:
+                embedder = Int8EmbeddingStore()
+            else:
+                embedder = InMemoryEmbeddingStore()
 
         description = (
             "Get the content of a Wikipedia page based on its title. "
@@ -154,13 +513,53 @@ class WikipediaPageTopN(TopN):
 
         super().__init__(
             wp,
-            5,
+            n,
             embedder,
             name=name,
             description=description,
             query_description=query_description,
         )
 
+    def invoke(self, context: Context, **kwargs) -> Any:
+        # Any other page tool goes through the generic TopN path
+        if not isinstance(self.tool, WikipediaPage):
+            return super().invoke(context, **kwargs)
+
+        # Rank the section texts directly rather than building the dict the
+        # page tool returns only to throw its keys away.
+        args, query = self.preprocess(context, **kwargs)
+        _, texts = self.tool.get_page_sections(**args)
+        if self.__min_chars > 0:
+            texts = [text for text in texts if len(text) >= self.__min_chars]
+        return self.postprocess(context, query, texts)
+
+
+# Process-wide tools shared by every WikipediaSearch agent, rather than
+# each agent building its own copies. The embedding store is deliberately
+# not shared - it holds the documents being ranked, so sharing it would
+# mix pages fetched by different agents into one index.
+_DEFAULT_TOPIC_TOOL: Optional[WikipediaTopicQuery] = None
+_DEFAULT_PAGE_TOOL: Optional[WikipediaPage] = None
+_DEFAULTS_LOCK = Lock()
+
+
+def _get_default_topic_tool() -> WikipediaTopicQuery:
+    global _DEFAULT_TOPIC_TOOL
+    if _DEFAULT_TOPIC_TOOL is None:
+        with _DEFAULTS_LOCK:
+            if _DEFAULT_TOPIC_TOOL is None:
+                _DEFAULT_TOPIC_TOOL = WikipediaTopicQuery()
+    return _DEFAULT_TOPIC_TOOL
+
+
+def _get_default_page_tool() -> WikipediaPage:
+    global _DEFAULT_PAGE_TOOL
+    if _DEFAULT_PAGE_TOOL is None:
+        with _DEFAULTS_LOCK:
+            if _DEFAULT_PAGE_TOOL is None:
+                _DEFAULT_PAGE_TOOL = WikipediaPage()
+    return _DEFAULT_PAGE_TOOL
+
 
 class WikipediaSearch(BackendAgent):
     """
@@ -205,17 +604,24 @@ class WikipediaSearch(BackendAgent):
                 raise ValueError("LLM is required if not specifying a backend")
             backend = ReActBackend(
                 llm,
-                [WikipediaPageTopN(embedder=embedder), WikipediaTopicQuery()],
+                [
+                    WikipediaPageTopN(
+                        wp=_get_default_page_tool(), embedder=embedder
+                    ),
+                    _get_default_topic_tool(),
+                ],
                 description,
             )
         else:
-            backend.add_tool(WikipediaTopicQuery())
+            backend.add_tool(_get_default_topic_tool())
             if compress_article:
-                if embedder is None:
-                    embedder = InMemoryEmbeddingStore()
-                backend.add_tool(WikipediaPageTopN(embedder=embedder))
+                backend.add_tool(
+                    WikipediaPageTopN(
+                        wp=_get_default_page_tool(), embedder=embedder
+                    )
+                )
             else:
-                backend.add_tool(WikipediaPage())
+                backend.add_tool(_get_default_page_tool())
         super().__init__(
             name,
             description,
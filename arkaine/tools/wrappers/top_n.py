@@ -145,20 +145,26 @@ class TopN(Wrapper):
             results = list(results.values())
 
         chunks = [
-            chunk_text_by_sentences(item, self._sentences_per)
+            chunk
             for item in results
+            for chunk in chunk_text_by_sentences(item, self._sentences_per)
         ]
 
-        # Initialize embedder based on configuration
-        if self._embedder_kwargs is not None:
-            embedder = self._embedder(**self._embedder_kwargs)
+        # If there are no more chunks than we'd return, ranking them would
+        # not filter anything out, so skip the embedding pass entirely.
+        if len(chunks) <= self._n:
+            search_results = chunks
         else:
-            embedder = self._embedder
+            # Initialize embedder based on configuration
+            if self._embedder_kwargs is not None:
+                embedder = self._embedder(**self._embedder_kwargs)
+            else:
+                embedder = self._embedder
 
-        for chunk in chunks:
-            embedder.add_text(chunk)
+            # Embed every chunk of every item in one batch
+            embedder.add_text(chunks)
 
-        search_results = embedder.query(query, top_n=self._n)
+            search_results = embedder.query(query, top_n=self._n)
 
         if self._output_formatter:
             return self._output_formatter(search_results)
@@ -5,17 +5,22 @@ from typing import List, Optional, Tuple, Union
 import numpy as np
 import ollama
 
+# A sentence runs from its first non-whitespace character through the first
+# word that ends in ., ?, or ! - that is, punctuation followed by whitespace
+# or the end of the text.
+_SENTENCE_RE = re.compile(r"(?=\S).*?[.?!](?!\S)", re.DOTALL)
+_PARAGRAPH_RE = re.compile(r"\n{2,}")
 
-def isolate_sentences(text: str) -> List[str]:
-    sentences = []
-    current_sentence = ""
-    for word in text.split():
-        current_sentence += word.strip() + " "
-        if word.endswith(".") or word.endswith("?") or word.endswith("!"):
-            sentences.append(current_sentence.strip())
-            current_sentence = ""
 
-    return sentences
+def isolate_sentences(text: str) -> List[str]:
+    """
+    isolate_sentences splits text into sentences, with the whitespace within
+    each sentence collapsed to single spaces. Any trailing words that do not
+    end a sentence are dropped.
+    """
+    return [
+        " ".join(match.group().split()) for match in _SENTENCE_RE.finditer(text)
+    ]
 
 
 def chunk_text_by_sentences(
@@ -25,18 +30,22 @@ def chunk_text_by_sentences(
     isolate_paragraphs: bool = False,
 ):
     if isolate_paragraphs:
-        paragraphs = re.split(r"\n{2,}", text)
+        paragraphs = _PARAGRAPH_RE.split(text)
         text = [p.strip() for p in paragraphs if p.strip()]
     else:
         text = [text]
 
     chunks = []
+    step = sentences_per + 1 - overlap
+    if step < 1:
+        raise ValueError("overlap must be no more than sentences_per")
 
+    # Walk the sentence list by offset rather than re-slicing the remainder
+    # after every chunk, which copied the rest of the list each time.
     for paragraph in text:
         sentences = isolate_sentences(paragraph)
-        while len(sentences) > 0:
-            chunks.append(" ".join(sentences[0:sentences_per]))
-            sentences = sentences[sentences_per + 1 - overlap :]
+        for start in range(0, len(sentences), step):
+            chunks.append(" ".join(sentences[start : start + sentences_per]))
 
     return chunks
 
@@ -76,12 +85,8 @@ class InMemoryEmbeddingStore:
         if isinstance(content, str):
             content = [content]
 
-        embeddings = []
-
-        for text in content:
-            embedding = self.get_embedding(text)
-            embeddings.append(embedding)
-            self.__memory__.append((text, embedding))
+        embeddings = self.get_embeddings(content)
+        self.__memory__.extend(zip(content, embeddings))
 
         return embeddings
 
@@ -89,9 +94,23 @@ class InMemoryEmbeddingStore:
         return cosine_distance(a, b)
 
     def get_embedding(self, text: str) -> List[float]:
-        return ollama.embeddings(model=self.__embedding_model__, prompt=text)[
-            "embedding"
-        ]
+        # Routed through the batch endpoint so that queries are embedded the
+        # same way as the documents they are compared against.
+        return self.get_embeddings([text])[0]
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        get_embeddings embeds all of the given texts in a single request to
+        the model, rather than paying the per-call overhead for each text.
+        """
+        if not texts:
+            return []
+
+        return list(
+            ollama.embed(model=self.__embedding_model__, input=texts)[
+                "embeddings"
+            ]
+        )
 
     def query(
         self,
@@ -120,3 +139,109 @@ class InMemoryEmbeddingStore:
         out = [x[0] for x in results]
 
         return out
+
+
+# Rows of the int8 matrix upcast at once while scoring a query
+_INT8_QUERY_BLOCK_ROWS = 4096
+
+
+class Int8EmbeddingStore(InMemoryEmbeddingStore):
+    """
+    Int8EmbeddingStore is an InMemoryEmbeddingStore that keeps each embedding
+    quantized to int8 with a per-vector scale, stacked into a single int8
+    matrix - a quarter of the memory of float32. Queries score the stored
+    vectors with integer matrix-vector products rather than one cosine
+    calculation per item, upcasting only a bounded block of rows at a time
+    so no wider copy of the matrix is ever kept.
+
+    Quantization costs a small amount of precision, which is rarely enough to
+    change the ordering of the closest results.
+    """
+
+    def __init__(self, embedding_model: Optional[str] = None):
+        super().__init__(embedding_model)
+        self.__texts: List[str] = []
+        self.__scales: List[float] = []
+        self.__norms: List[float] = []
+        # Vectors added since the last query, folded into the stacked int8
+        # matrix (and then dropped) when the next query runs
+        self.__pending: List[np.ndarray] = []
+        self.__matrix: Optional[np.ndarray] = None
+
+    @staticmethod
+    def quantize(embedding: List[float]) -> Tuple[np.ndarray, float]:
+        """
+        quantize converts a float vector into an int8 vector and the scale
+        needed to approximately recover it (vector * scale).
+        """
+        vector = np.asarray(embedding, dtype=np.float32)
+        scale = float(np.max(np.abs(vector))) / 127 if vector.size else 0.0
+        if scale == 0.0:
+            return np.zeros(vector.shape, dtype=np.int8), 1.0
+
+        quantized = np.round(vector / scale).clip(-127, 127).astype(np.int8)
+        return quantized, scale
+
+    def add_text(self, content: Union[str, List[str]]) -> List[List[float]]:
+        if isinstance(content, str):
+            content = [content]
+
+        embeddings = self.get_embeddings(content)
+
+        for text, embedding in zip(content, embeddings):
+            quantized, scale = self.quantize(embedding)
+            self.__texts.append(text)
+            self.__pending.append(quantized)
+            self.__scales.append(scale)
+            self.__norms.append(
+                float(np.linalg.norm(np.asarray(embedding, dtype=np.float32)))
+            )
+
+        return embeddings
+
+    def query(
+        self,
+        query: str,
+        top_n: Optional[int] = 10,
+    ) -> List[str]:
+        if not self.__texts:
+            return []
+
+        query_embedding = self.get_embedding(query)
+        query_vector, query_scale = self.quantize(query_embedding)
+        query_norm = float(
+            np.linalg.norm(np.asarray(query_embedding, dtype=np.float32))
+        )
+
+        if self.__pending:
+            stacked = [np.stack(self.__pending)]
+            if self.__matrix is not None:
+                stacked.insert(0, self.__matrix)
+            self.__matrix = np.concatenate(stacked)
+            self.__pending = []
+
+        # int8 products would overflow, so each block of rows is upcast to
+        # int32 only for the duration of its product.
+        query_vector = query_vector.astype(np.int32)
+        dots = np.empty(len(self.__texts), dtype=np.int64)
+        for start in range(0, len(self.__matrix), _INT8_QUERY_BLOCK_ROWS):
+            end = start + _INT8_QUERY_BLOCK_ROWS
+            dots[start:end] = (
+                self.__matrix[start:end].astype(np.int32) @ query_vector
+            )
+
+        # Rescale the integer dot products back to cosine similarity
+        denominators = np.asarray(self.__norms) * query_norm
+        similarities = np.divide(
+            dots * np.asarray(self.__scales) * query_scale,
+            denominators,
+            out=np.zeros(len(self.__texts)),
+            where=denominators != 0,
+        )
+
+        # Highest similarity is best
+        order = np.argsort(-similarities, kind="stable")
+        if top_n:
+            order = order[:top_n]
+
+        return [self.__texts[index] for index in order]
@@ -1,9 +1,12 @@
+from unittest.mock import patch
+
+import numpy as np
 import pytest
 
 from arkaine.utils.documents import (
     InMemoryEmbeddingStore,
+    Int8EmbeddingStore,
     chunk_text_by_sentences,
-    generate_embedding,
     isolate_sentences,
 )
 
@@ -120,7 +123,7 @@ async def test_in_memory_embedding_store(mock_embedding_model):
 def test_generate_embedding():
     """Test embedding generation"""
     text = "This is a test document"
-    embedding = generate_embedding(text)
+    embedding = InMemoryEmbeddingStore().get_embedding(text)
     assert isinstance(embedding, list)
     assert all(isinstance(x, float) for x in embedding)
 
@@ -132,3 +135,90 @@ def test_generate_embedding_mock(mock_embedding_model):
     assert isinstance(embedding, list)
     assert len(embedding) == 384  # Size we defined in mock
     assert all(isinstance(x, float) for x in embedding)
+
+
+@pytest.fixture
+def fixed_embeddings():
+    vectors = {
+        "north": [0.0, 1.0, 0.1],
+        "north east": [0.7, 0.7, 0.0],
+        "east": [1.0, 0.05, 0.0],
+        "south": [0.0, -1.0, 0.2],
+        "west": [-0.9, 0.1, 0.3],
+        "query": [0.2, 0.9, 0.05],
+    }
+
+    def get_embeddings(self, texts):
+        return [vectors[text] for text in texts]
+
+    with patch.object(InMemoryEmbeddingStore, "get_embeddings", get_embeddings):
+        yield vectors
+
+
+def test_int8_quantize_round_trips():
+    """Test quantized vectors recover the original within one step"""
+    embedding = [0.5, -0.25, 1.0, -1.27, 0.0]
+    quantized, scale = Int8EmbeddingStore.quantize(embedding)
+
+    assert quantized.dtype == np.int8
+    assert np.max(np.abs(quantized)) == 127
+    assert np.allclose(quantized * scale, embedding, atol=scale)
+
+
+def test_int8_quantize_zero_vector():
+    """Test an all zero vector quantizes without dividing by zero"""
+    quantized, scale = Int8EmbeddingStore.quantize([0.0, 0.0, 0.0])
+
+    assert quantized.tolist() == [0, 0, 0]
+    assert quantized.dtype == np.int8
+    assert scale == 1.0
+
+
+def test_int8_store_matches_in_memory_ranking(fixed_embeddings):
+    """Test the int8 store ranks the same as the float store"""
+    texts = ["north", "north east", "east", "south", "west"]
+
+    float_store = InMemoryEmbeddingStore()
+    float_store.add_text(texts)
+    int8_store = Int8EmbeddingStore()
+    int8_store.add_text(texts)
+
+    assert int8_store.query("query", top_n=3) == float_store.query(
+        "query", top_n=3
+    )
+    assert int8_store.query("query", top_n=3) == [
+        "north",
+        "north east",
+        "east",
+    ]
+
+
+def test_int8_store_top_n_none_returns_everything(fixed_embeddings):
+    """Test top_n=None returns every stored text, best first"""
+    store = Int8EmbeddingStore()
+    store.add_text(["south", "east"])
+    store.add_text("north")
+
+    results = store.query("query", top_n=None)
+    assert sorted(results) == ["east", "north", "south"]
+    assert results[0] == "north"
+
+
+def test_int8_store_empty_query(fixed_embeddings):
+    """Test querying an empty store returns no results"""
+    assert Int8EmbeddingStore().query("query") == []
+
+
+def test_int8_store_keeps_one_int8_matrix(fixed_embeddings):
+    """Test texts added after a query are folded into the int8 matrix"""
+    store = Int8EmbeddingStore()
+    store.add_text(["south", "west"])
+    assert store.query("query", top_n=1) == ["west"]
+
+    store.add_text(["north", "east"])
+    with patch("arkaine.utils.documents._INT8_QUERY_BLOCK_ROWS", 3):
+        assert store.query("query", top_n=2) == ["north", "east"]
+
+    matrix = store._Int8EmbeddingStore__matrix
+    assert matrix.dtype == np.int8
+    assert matrix.shape == (4, 3)
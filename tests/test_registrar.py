@@ -58,6 +58,11 @@ def test_duplicate_tool_registration(mock_tool):
     assert len(Registrar._tools) == 1
     assert mock_tool.id in Registrar._tools
 
+    # Re-registering should not attach another call listener
+    listener_count = len(mock_tool._on_call_listeners)
+    Registrar.register(mock_tool)
+    assert len(mock_tool._on_call_listeners) == listener_count
+
 
 def test_tool_call_notification():
     # Clear any existing tools and listeners
@@ -103,3 +108,15 @@ def test_set_auto_registry():
     # Test setting auto registry to False
     Registrar.set_auto_registry(False)
     assert Registrar.is_enabled() is False
+
+
+def test_executor_is_lazy_and_can_shutdown():
+    Registrar.shutdown(wait=True)
+    assert Registrar._Registrar__executor is None
+
+    # The executor is created on first use and then reused
+    executor = Registrar._get_executor()
+    assert Registrar._get_executor() is executor
+
+    Registrar.shutdown(wait=True)
+    assert Registrar._Registrar__executor is None
@@ -0,0 +1,72 @@
+from unittest.mock import patch
+
+import pytest
+
+from arkaine.flow.retry import Retry
+from arkaine.tools.tool import Argument, Context, Tool
+
+
+@pytest.fixture
+def failing_tool():
+    def fail(value: str) -> str:
+        raise ValueError("always fails")
+
+    return Tool(
+        name="failing_tool",
+        description="A tool that always fails",
+        args=[Argument("value", "Any value", "string", required=True)],
+        func=fail,
+    )
+
+
+def sleeps_for(tool, **retry_kwargs):
+    retrier = Retry(tool, jitter=0, **retry_kwargs)
+    with patch("arkaine.flow.retry.time.sleep") as sleep:
+        with pytest.raises(ValueError):
+            retrier(Context(), value="x")
+    return [call.args[0] for call in sleep.call_args_list]
+
+
+def test_retry_backs_off_exponentially(failing_tool):
+    assert sleeps_for(failing_tool, max_retries=4, delay=1) == [
+        1,
+        2,
+        4,
+        8,
+    ]
+
+
+def test_retry_caps_backoff_at_max_delay(failing_tool):
+    assert sleeps_for(failing_tool, max_retries=4, delay=1, max_delay=3) == [
+        1,
+        2,
+        3,
+        3,
+    ]
+
+
+def test_retry_does_not_shorten_base_delay(failing_tool):
+    assert sleeps_for(failing_tool, max_retries=3, delay=60, max_delay=30) == [
+        60,
+        60,
+        60,
+    ]
+
+
+def test_retry_fixed_delay(failing_tool):
+    assert sleeps_for(
+        failing_tool, max_retries=3, delay=2, backoff_factor=1
+    ) == [2, 2, 2]
+
+
+def test_retry_no_delay_does_not_sleep(failing_tool):
+    assert sleeps_for(failing_tool, max_retries=3) == []
+
+
+def test_retry_adds_jitter(failing_tool):
+    retrier = Retry(failing_tool, 2, delay=1, jitter=0.5)
+    with patch("arkaine.flow.retry.random.uniform", return_value=0.25):
+        with patch("arkaine.flow.retry.time.sleep") as sleep:
+            with pytest.raises(ValueError):
+                retrier(Context(), value="x")
+    assert [call.args[0] for call in sleep.call_args_list] == [1.25, 2.25]
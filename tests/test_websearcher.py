@@ -0,0 +1,154 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from arkaine.llms.llm import LLM
+from arkaine.toolbox.websearcher import SearchQueryJudge, Websearcher2
+
+
+@pytest.fixture
+def judge():
+    with patch("arkaine.toolbox.websearcher.Website.get_title"):
+        yield SearchQueryJudge(MagicMock(spec=LLM))
+
+
+def judged(judge, output):
+    return [(site.url, site.snippet) for site in judge.process_answer(output)]
+
+
+def searched(answer):
+    # Websearcher2 is abstract, but process_answer does not depend on the
+    # instance
+    return [
+        (site.url, site.title, site.snippet)
+        for site in Websearcher2.process_answer(None, answer)
+    ]
+
+
+def test_judge_parses_pairs(judge):
+    output = (
+        "SITE: https://a.com\n"
+        "REASON: First site\n"
+        "SITE: https://b.com\n"
+        "REASON: Second site\n"
+    )
+    assert judged(judge, output) == [
+        ("https://a.com", "First site"),
+        ("https://b.com", "Second site"),
+    ]
+
+
+def test_judge_strips_bullets_and_numbers(judge):
+    output = (
+        "1. SITE: https://a.com\n"
+        "   - REASON: Numbered\n"
+        "* site: https://b.com\n"
+        "  * reason: Bulleted, lowercase\n"
+    )
+    assert judged(judge, output) == [
+        ("https://a.com", "Numbered"),
+        ("https://b.com", "Bulleted, lowercase"),
+    ]
+
+
+def test_judge_ignores_interleaved_lines(judge):
+    output = (
+        "Here are the sites I chose:\n"
+        "\n"
+        "SITE: https://a.com\n"
+        "This one looks promising.\n"
+        "\n"
+        "REASON: Covers the topic\n"
+        "Some closing remark.\n"
+    )
+    assert judged(judge, output) == [("https://a.com", "Covers the topic")]
+
+
+def test_judge_handles_crlf(judge):
+    output = "SITE: https://a.com\r\nREASON: Windows newlines\r\n"
+    assert judged(judge, output) == [("https://a.com", "Windows newlines")]
+
+
+def test_judge_site_without_reason_is_dropped(judge):
+    output = (
+        "SITE: https://orphan.com\n"
+        "SITE: https://a.com\n"
+        "REASON: Has a reason\n"
+        "SITE: https://trailing.com\n"
+    )
+    assert judged(judge, output) == [("https://a.com", "Has a reason")]
+
+
+def test_judge_none_and_empty(judge):
+    assert judge.process_answer("NONE") == []
+    with pytest.raises(ValueError):
+        judge.process_answer("No sites here")
+
+
+def test_search_parses_pairs_and_markers():
+    answer = (
+        "Thought: I found some sites\n"
+        "SITE: https://a.com\n"
+        "REASON: First site\n"
+        "Action: done\n"
+        "site: https://b.com\n"
+        "reason: Second site\n"
+    )
+    assert searched(answer) == [
+        ("https://a.com", "https://a.com", "First site"),
+        ("https://b.com", "https://b.com", "Second site"),
+    ]
+
+
+def test_search_strips_bullets_and_formatting():
+    answer = (
+        "- **SITE:** https://a.com\n"
+        "- **REASON:** Bold _labels_\n"
+        "2. `SITE: https://b.com`\n"
+        "2. `REASON: Inline code`\n"
+    )
+    assert searched(answer) == [
+        ("https://a.com", "https://a.com", "Bold labels"),
+        ("https://b.com", "https://b.com", "Inline code"),
+    ]
+
+
+def test_search_markdown_links():
+    answer = (
+        "SITE: [Site A](https://a.com)\n"
+        "REASON: Linked\n"
+        "SITE: [Empty]()\n"
+        "REASON: No url, skipped\n"
+    )
+    assert searched(answer) == [("https://a.com", "Site A", "Linked")]
+
+
+def test_search_ignores_interleaved_lines():
+    answer = (
+        "SITE: https://a.com\n"
+        "\n"
+        "Unrelated commentary\n"
+        "REASON: Still paired\n"
+    )
+    assert searched(answer) == [
+        ("https://a.com", "https://a.com", "Still paired")
+    ]
+
+
+def test_search_handles_crlf():
+    answer = "SITE: https://a.com\r\nREASON: Windows newlines\r\n"
+    assert searched(answer) == [
+        ("https://a.com", "https://a.com", "Windows newlines")
+    ]
+
+
+def test_search_site_without_reason_is_dropped():
+    answer = (
+        "SITE: https://orphan.com\n"
+        "SITE: https://a.com\n"
+        "REASON: Has a reason\n"
+        "SITE: https://trailing.com\n"
+    )
+    assert searched(answer) == [
+        ("https://a.com", "https://a.com", "Has a reason")
+    ]
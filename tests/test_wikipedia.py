@@ -0,0 +1,92 @@
+from unittest.mock import patch
+
+import pytest
+
+from arkaine.toolbox.wikipedia import (
+    WikipediaDiskCache,
+    WikipediaPageTopN,
+    _DiskCachedEmbeddingStore,
+)
+from arkaine.utils.documents import InMemoryEmbeddingStore
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path / "cache")
+
+
+def test_disk_cache_sections_round_trip(cache_dir):
+    """Test sections are stored and returned as parallel lists"""
+    cache = WikipediaDiskCache(cache_dir)
+    assert cache.get_sections("Rome") is None
+
+    cache.set_sections("Rome", ["_preamble", "History"], ["Lead.", "Old."])
+    assert cache.get_sections("Rome") == (
+        ["_preamble", "History"],
+        ["Lead.", "Old."],
+    )
+    assert cache.get_sections("Paris") is None
+
+
+def test_disk_cache_sections_overwrite(cache_dir):
+    """Test setting a page again replaces its sections"""
+    cache = WikipediaDiskCache(cache_dir)
+    cache.set_sections("Rome", ["A"], ["First."])
+    cache.set_sections("Rome", ["B"], ["Second."])
+
+    assert cache.get_sections("Rome") == (["B"], ["Second."])
+
+
+def test_disk_cache_embeddings_keyed_by_model(cache_dir):
+    """Test embeddings round trip as float32 and are scoped per model"""
+    cache = WikipediaDiskCache(cache_dir)
+    assert cache.get_embedding("model-a", "text") is None
+
+    cache.set_embedding("model-a", "text", [0.5, -0.25, 1.0])
+    assert cache.get_embedding("model-a", "text") == [0.5, -0.25, 1.0]
+    assert cache.get_embedding("model-b", "text") is None
+
+
+def test_disk_cache_persists_across_instances(cache_dir):
+    """Test a new cache over the same directory sees earlier writes"""
+    first = WikipediaDiskCache(cache_dir)
+    first.set_sections("Rome", ["A"], ["Text."])
+    first.set_embedding("model", "Text.", [1.0, 2.0])
+
+    second = WikipediaDiskCache(cache_dir)
+    assert second.get_sections("Rome") == (["A"], ["Text."])
+    assert second.get_embedding("model", "Text.") == [1.0, 2.0]
+
+
+def test_disk_cached_store_only_embeds_misses(cache_dir):
+    """Test the disk cached store sends only uncached texts to the model"""
+    cache = WikipediaDiskCache(cache_dir)
+    cache.set_embedding("all-minilm:latest", "cached", [1.0, 0.0])
+
+    requested = []
+
+    def get_embeddings(self, texts):
+        requested.append(list(texts))
+        return [[0.0, float(len(text))] for text in texts]
+
+    with patch.object(InMemoryEmbeddingStore, "get_embeddings", get_embeddings):
+        store = _DiskCachedEmbeddingStore(cache)
+        embeddings = store.get_embeddings(["cached", "new", "newer"])
+
+        assert embeddings == [[1.0, 0.0], [0.0, 3.0], [0.0, 5.0]]
+        assert requested == [["new", "newer"]]
+
+        # Everything is now cached, so nothing is sent to the model
+        store.get_embeddings(["new", "newer"])
+        assert requested == [["new", "newer"]]
+
+
+def test_page_top_n_shares_one_disk_cache(cache_dir):
+    """Test the page tool and embedding store use the same cache"""
+    top_n = WikipediaPageTopN(cache_dir=cache_dir)
+
+    assert isinstance(top_n._embedder, _DiskCachedEmbeddingStore)
+    assert (
+        top_n.tool._WikipediaPage__cache
+        is top_n._embedder._DiskCachedEmbeddingStore__cache
+    )